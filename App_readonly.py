@@ -13,14 +13,32 @@ Exécuter :
 """
 
 import os
+import hashlib
+import tempfile
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
 from io import BytesIO
 from datetime import datetime
+from typing import Optional
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+try:  # optionnel : noyau compilé pour les gros fichiers
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:  # optionnel : moteur de pandas.eval (multithread, par blocs)
+    import numexpr  # noqa: F401
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
 # ------------------------------
 # 0) Configuration & thème
 # ------------------------------
@@ -46,35 +64,200 @@ PROGRESS_MAP = {
     "Finalisation": 1.00,
     "None": 0.00,
 }
+# Etape en Categorical à catégories fixes : le code 0..3 EST le rang STEP_RANK, le code 4 est "None"
+ETAPE_CATEGORIES = STEPS_ORDER + ["None"]
+assert all(ETAPE_CATEGORIES.index(s) == r for s, r in STEP_RANK.items()), "code Etape != rang STEP_RANK"
+PROGRESS_ARR = np.array([PROGRESS_MAP[c] for c in ETAPE_CATEGORIES], dtype="float32")  # indexé par code
+
+# Jauge : rouge < 50 <= orange < 80 <= vert
+GAUGE_THRESHOLDS = [50, 80]
+GAUGE_COLORS = ["red", "orange", "green"]
+
+EVAL_MIN_ROWS = 10_000  # en dessous, la mise en place de numexpr coûte plus qu'elle ne rapporte
 
 # ------------------------------
 # 1) Chargement des données
 # ------------------------------
 DEFAULT_XLSX = os.getenv("DEFAULT_XLSX", "Structural_data.xlsx")  # même dossier que l'application par défaut
 
-@st.cache_data(show_spinner=False)
+# Cache disque des feuilles déjà lues (Feather, clé = empreinte du fichier).
+# Contient une copie des classeurs importés : répertoire privé (0700), fichiers 0600, conservation bornée.
+FEATHER_CACHE_DIR = os.getenv(
+    "ACACIA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "acacia_dashboard_cache")
+)
+FEATHER_CACHE_MAX_FILES = 8
+FEATHER_CACHE_MAX_AGE_S = 24 * 3600  # une entrée non relue depuis 24 h est supprimée
+FEATHER_CACHE_VERSION = 3  # à incrémenter à tout changement du format lu (colonnes, dtypes, conversions)
+
+# Seules colonnes utilisées par l'application (RowProgress% / CompletedMass_Row sont toujours recalculées)
+USED_COLUMNS = ["PHASE", "ASSEMBLY NO.", "PART NO.", "TOT MASS (Kg)", "Etape"]
+# PHASE lue sans typage puis astype(str) dans _read_sheet : mêmes libellés qu'auparavant ("1.0", "nan"…)
+READ_DTYPES = {
+    "ASSEMBLY NO.": "string",
+    "PART NO.": "string",
+    "TOT MASS (Kg)": "float32",  # 2 décimales affichées : float32 suffit et divise la bande passante par 2
+    "Etape": "category",
+}
+
+
+def _read_sheet(path_or_buffer, engine: str) -> pd.DataFrame:
+    """Lit uniquement USED_COLUMNS, typées ; sans typage si une cellule ne se convertit pas."""
+    usecols = lambda c: c in USED_COLUMNS  # tolère les colonnes absentes (contrôlées dans ensure_columns)
+    try:
+        df = pd.read_excel(path_or_buffer, engine=engine, usecols=usecols, dtype=READ_DTYPES)
+    except (ValueError, TypeError):
+        # Ex. texte (ValueError) ou date (TypeError) dans TOT MASS (Kg) : coercition laissée à ensure_columns
+        if hasattr(path_or_buffer, "seek"):
+            path_or_buffer.seek(0)
+        df = pd.read_excel(path_or_buffer, engine=engine, usecols=usecols)
+    if "PHASE" in df.columns:
+        # Libellés comme l'ancien astype(str) (1.0, nan) ; colonne homogène, donc sérialisable en Feather
+        df["PHASE"] = df["PHASE"].astype(str)
+    return df
+
+
+def file_fingerprint(path_or_buffer) -> tuple:
+    """Empreinte O(1) d'une source Excel : (chemin, taille, mtime) ou (taille, sha1 des 4 Ko de tête/queue)."""
+    if isinstance(path_or_buffer, str):
+        try:
+            st_ = os.stat(path_or_buffer)
+        except OSError:
+            return (path_or_buffer, None, None)  # l'erreur de lecture sera levée par load_excel
+        return (path_or_buffer, st_.st_size, st_.st_mtime_ns)
+    with path_or_buffer.getbuffer() as buf:  # vue mémoire, sans copie des octets
+        head_tail = bytes(buf[:4096]) + bytes(buf[-4096:])
+        return (len(buf), hashlib.sha1(head_tail).digest())
+
+
+def _feather_path(fingerprint: tuple) -> str:
+    """Fichier Feather associé à une empreinte (version, colonnes et dtypes inclus : tout changement invalide)."""
+    key = hashlib.sha1(repr((FEATHER_CACHE_VERSION, fingerprint, USED_COLUMNS, READ_DTYPES)).encode()).hexdigest()
+    return os.path.join(FEATHER_CACHE_DIR, f"{key}.feather")
+
+
+def _private_cache_dir() -> Optional[str]:
+    """Crée FEATHER_CACHE_DIR en 0700 ; None (cache désactivé) s'il appartient à un autre utilisateur."""
+    try:
+        os.makedirs(FEATHER_CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.stat(FEATHER_CACHE_DIR)
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            return None  # répertoire partagé pré-créé par un tiers : on n'y lit ni n'écrit rien
+        if info.st_mode & 0o077:
+            os.chmod(FEATHER_CACHE_DIR, 0o700)
+    except OSError:
+        return None
+    return FEATHER_CACHE_DIR
+
+
+def read_cached_frame(fingerprint: tuple) -> Optional[pd.DataFrame]:
+    """Relit une feuille déjà parsée depuis le cache disque ; None si absente, expirée ou illisible."""
+    if _private_cache_dir() is None:
+        return None
+    path = _feather_path(fingerprint)
+    try:
+        if time.time() - os.stat(path).st_mtime > FEATHER_CACHE_MAX_AGE_S:
+            os.remove(path)
+            return None
+        df = pd.read_feather(path, use_threads=True)
+        os.utime(path)  # LRU : marque l'entrée comme récente
+    except (OSError, ValueError):
+        return None
+    return df
+
+
+def write_cached_frame(fingerprint: tuple, df: pd.DataFrame) -> None:
+    """Écrit la feuille parsée dans le cache disque (fichier 0600) puis applique la rétention.
+
+    Rétention : au plus FEATHER_CACHE_MAX_FILES entrées (les moins récemment lues sont évincées) et
+    suppression de toute entrée non relue depuis FEATHER_CACHE_MAX_AGE_S.
+    """
+    if _private_cache_dir() is None:
+        return
+    path = _feather_path(fingerprint)
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # écriture puis renommage : jamais de fichier partiel lisible
+    try:
+        df.to_feather(tmp_path)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+        entries = sorted(
+            (e for e in os.scandir(FEATHER_CACHE_DIR) if e.name.endswith(".feather")),
+            key=lambda e: e.stat().st_mtime,
+            reverse=True,
+        )
+        now = time.time()
+        for i, e in enumerate(entries):
+            if i >= FEATHER_CACHE_MAX_FILES or now - e.stat().st_mtime > FEATHER_CACHE_MAX_AGE_S:
+                os.remove(e.path)
+    except (OSError, ValueError, TypeError):
+        # Cache best-effort (disque en lecture seule, colonne de types mixtes non sérialisable…)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _fingerprint_bytes(path_or_buffer) -> bytes:
+    """hash_func de load_excel : des octets, que Streamlit ne re-hache pas.
+
+    Renvoyer le tuple brut ferait re-hacher le chemin (str) par ce même hash_func : la garde anti-cycle
+    de Streamlit le remplacerait alors par un marqueur et la clé ignorerait le chemin.
+    """
+    return repr(file_fingerprint(path_or_buffer)).encode()
+
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={
+        str: _fingerprint_bytes,
+        BytesIO: _fingerprint_bytes,
+        "streamlit.runtime.uploaded_file_manager.UploadedFile": _fingerprint_bytes,
+    },
+)
 def load_excel(path_or_buffer):
-    """Lit la première feuille automatiquement (évite les erreurs de nom)."""
-    return pd.read_excel(path_or_buffer, engine="openpyxl")
+    """Lit la première feuille automatiquement (évite les erreurs de nom).
+
+    Moteur calamine (Rust, bien plus rapide) ; repli sur openpyxl (lecture seule) s'il n'est pas installé.
+    Une feuille déjà lue est relue depuis le cache Feather, sans parser le XLSX.
+    """
+    fingerprint = file_fingerprint(path_or_buffer)
+    df = read_cached_frame(fingerprint)
+    if df is not None:
+        return df
+    try:
+        df = _read_sheet(path_or_buffer, engine="calamine")
+    except ImportError:
+        df = _read_sheet(path_or_buffer, engine="openpyxl")
+    write_cached_frame(fingerprint, df)
+    return df
 
 
 def ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Vérifie les colonnes attendues & initialise les colonnes app si absentes."""
+    """Vérifie les colonnes attendues & initialise Etape si absente.
+
+    RowProgress% / CompletedMass_Row ne sont pas lues (USED_COLUMNS) : recompute_progress les crée.
+    """
     required = ["PHASE", "ASSEMBLY NO.", "PART NO.", "TOT MASS (Kg)"]
-    for c in required:
-        if c not in df.columns:
-            st.error(f"⚠️ Colonne manquante dans Excel : '{c}'")
-            st.stop()
-    # Harmonisation
-    df["PHASE"] = df["PHASE"].astype(str)
-    df["TOT MASS (Kg)"] = pd.to_numeric(df["TOT MASS (Kg)"], errors="coerce").fillna(0.0)
-    # Colonnes d'application (si absentes)
+    missing = [c for c in required if c not in df.columns]
+    if missing:
+        st.error("⚠️ Colonne(s) manquante(s) dans Excel : " + ", ".join(f"'{c}'" for c in missing))
+        st.stop()
+    # Harmonisation (chaque conversion n'a lieu que si le type lu ne convient pas déjà).
+    # PHASE : libellés de astype(str) sur la valeur lue, sans typage préalable ("1.0" pour une phase float)
+    if not pd.api.types.is_string_dtype(df["PHASE"]):
+        df["PHASE"] = df["PHASE"].astype(str)
+    elif df["PHASE"].hasnans:
+        df["PHASE"] = df["PHASE"].fillna("nan")  # même libellé que astype(str) sur une cellule vide
+    if not isinstance(df["PHASE"].dtype, pd.CategoricalDtype):
+        df["PHASE"] = df["PHASE"].astype("category")  # codes entiers : groupby / unique / égalités rapides
+    if not pd.api.types.is_numeric_dtype(df["TOT MASS (Kg)"]):
+        df["TOT MASS (Kg)"] = pd.to_numeric(df["TOT MASS (Kg)"], errors="coerce")
+    if df["TOT MASS (Kg)"].dtype != np.float32:
+        df["TOT MASS (Kg)"] = df["TOT MASS (Kg)"].astype("float32")
+    if df["TOT MASS (Kg)"].hasnans:
+        df["TOT MASS (Kg)"] = df["TOT MASS (Kg)"].fillna(np.float32(0.0))
+    # Colonne d'application (si absente)
     if "Etape" not in df.columns:
         df["Etape"] = "None"
-    if "RowProgress%" not in df.columns:
-        df["RowProgress%"] = 0.0
-    if "CompletedMass_Row" not in df.columns:
-        df["CompletedMass_Row"] = 0.0
+    # Valeur inconnue ou vide -> "None" ; codes alignés sur ETAPE_CATEGORIES
+    df["Etape"] = pd.Categorical(df["Etape"], categories=ETAPE_CATEGORIES).fillna("None")
     return df
 
 st.sidebar.header("🛠️ Données (Lecture seule)")
@@ -84,31 +267,34 @@ uploaded = st.sidebar.file_uploader(
     help="Optionnel : sinon le fichier par défaut sera utilisé."
 )
 
-try:
-    if uploaded is not None:
-        df_loaded = load_excel(uploaded)
-        source_label = f"Fichier importé : {uploaded.name}"
-        current_source_key = f"upload::{uploaded.name}"
-    else:
-        df_loaded = load_excel(DEFAULT_XLSX)
-        source_label = f"Fichier local : {DEFAULT_XLSX}"
-        current_source_key = f"local::{DEFAULT_XLSX}"
-except Exception as e:
-    st.error(f"❌ Échec de chargement : {e}")
-    st.stop()
-
-df_loaded = ensure_columns(df_loaded)
-st.caption(f"✅ {source_label}")
+if uploaded is not None:
+    source = uploaded
+    source_label = f"Fichier importé : {uploaded.name}"
+    current_source_key = f"upload::{uploaded.name}"
+else:
+    source = DEFAULT_XLSX
+    source_label = f"Fichier local : {DEFAULT_XLSX}"
+    current_source_key = f"local::{DEFAULT_XLSX}"
+current_fingerprint = file_fingerprint(source)
 
 # ------------------------------
 # 1.b) Initialisation état partagé (SESSION)
 # ------------------------------
-if "df" not in st.session_state:
-    st.session_state["df"] = df_loaded.copy()
-    st.session_state["source_key"] = current_source_key
-elif st.session_state.get("source_key") != current_source_key:
-    st.session_state["df"] = df_loaded.copy()
+# Même empreinte que la session : ni lecture ni passage par st.cache_data.
+# df_loaded est déjà une copie propre à ce rerun (st.cache_data) : référence conservée sans .copy()
+if "df" not in st.session_state or st.session_state.get("source_fp") != current_fingerprint:
+    try:
+        df_loaded = load_excel(source)
+    except Exception as e:
+        st.error(f"❌ Échec de chargement : {e}")
+        st.stop()
+    # Tri stable par PHASE : blocs contigus exploités par compute_all (np.add.reduceat)
+    st.session_state["df"] = ensure_columns(df_loaded).sort_values("PHASE", kind="stable", ignore_index=True)
     st.session_state["source_key"] = current_source_key
+    st.session_state["source_fp"] = current_fingerprint
+    st.session_state["df_version"] = st.session_state.get("df_version", 0) + 1
+    st.session_state["progress_ready"] = False
+st.caption(f"✅ {source_label}")
 
 if "refresh_needed" not in st.session_state:
     st.session_state["refresh_needed"] = False
@@ -118,81 +304,156 @@ if "refresh_needed" not in st.session_state:
 # ------------------------------
 
 def recompute_progress(df: pd.DataFrame) -> pd.DataFrame:
-    """Recalcule RowProgress% (pondéré par Étape) et CompletedMass_Row (masse × RowProgress%)."""
-    out = df.copy()
-    out["RowProgress%"] = out["Etape"].map(PROGRESS_MAP).fillna(0.0)
-    out["CompletedMass_Row"] = out["TOT MASS (Kg)"] * out["RowProgress%"]
-    return out
+    """Recalcule RowProgress% (pondéré par Étape) et CompletedMass_Row (masse × RowProgress%), en place.
+
+    Tient aussi à jour _EtapeRank (int8, rang STEP_RANK, -1 si aucune étape), lu par compute_all et
+    assembly_table : toute modification de Etape doit repasser par cette fonction.
+    """
+    codes = df["Etape"].cat.codes.to_numpy()  # 0..3 : étapes, 4 : "None" (cf. ensure_columns)
+    prog = PROGRESS_ARR[codes]
+    df["RowProgress%"] = prog
+    if HAS_NUMEXPR and len(df) > EVAL_MIN_ROWS:
+        completed = df.eval("`TOT MASS (Kg)` * `RowProgress%`").to_numpy()
+    else:
+        completed = df["TOT MASS (Kg)"].to_numpy() * prog
+    # Affectation (pas d'écriture en place) : float32 quel que soit le chemin
+    df["CompletedMass_Row"] = completed.astype("float32", copy=False)
+    df["_EtapeRank"] = np.where(codes < len(STEPS_ORDER), codes, -1).astype("int8")
+    return df
 
 
-@st.cache_data(show_spinner=False)
-def step_advancement(df: pd.DataFrame) -> pd.DataFrame:
+def session_cached(name: str, func, df: pd.DataFrame):
+    """Mémoïse func(df) dans la session, clé (name, source_key, df_version) — évite le hachage du DataFrame."""
+    cache = st.session_state.setdefault("_agg_cache", {})
+    key = (name, st.session_state.get("source_key"), st.session_state.get("df_version", 0))
+    if key not in cache:
+        # Purge des entrées d'une version antérieure de ce même agrégat
+        for k in [k for k in cache if k[0] == name]:
+            del cache[k]
+        cache[key] = func(df)
+    return cache[key]
+
+
+def _cum_mass_numpy(ranks: np.ndarray, mass: np.ndarray, n_steps: int) -> np.ndarray:
+    """Masse traitée au rang >= k, pour k = 0..n_steps-1 (rang < 0 : non comptée)."""
+    valid = ranks >= 0
+    per_rank = np.bincount(ranks[valid], weights=mass[valid], minlength=n_steps)
+    return np.cumsum(per_rank[::-1], dtype="float64")[::-1]
+
+
+if njit is not None:
+    @njit(cache=True)  # cache disque : pas de recompilation à chaque rerun / redémarrage
+    def _cum_mass(ranks, mass, n_steps):
+        """Version Numba de _cum_mass_numpy : une seule boucle sur les tableaux contigus."""
+        out = np.zeros(n_steps)
+        for i in range(ranks.size):
+            r = ranks[i]
+            if r >= 0:
+                out[r] += mass[i]
+        acc = 0.0
+        for k in range(n_steps - 1, -1, -1):
+            acc += out[k]
+            out[k] = acc
+        return out
+else:
+    _cum_mass = _cum_mass_numpy
+
+
+@dataclass(frozen=True)
+class ProgressSummary:
+    """Agrégats des onglets KPI / Graphiques, produits en une seule passe par compute_all."""
+    total_mass: float
+    completed_global_mass: float
+    step_treated: np.ndarray   # masse traitée au rang >= étape, dans l'ordre STEPS_ORDER
+    phase_names: pd.Index
+    phase_totals: np.ndarray
+    phase_treated: np.ndarray
+
+    @property
+    def progress_global(self) -> float:
+        return (self.completed_global_mass / self.total_mass) * 100 if self.total_mass > 0 else 0.0
+
+
+def compute_all(df: pd.DataFrame) -> ProgressSummary:
+    """Lit masse et CompletedMass_Row une seule fois et en tire tous les agrégats (totaux, étapes, phases).
+
+    Suppose df trié par PHASE (fait au chargement) : np.add.reduceat sur les blocs contigus.
+    """
+    mass = df["TOT MASS (Kg)"].to_numpy(dtype="float64")  # np.bincount : poids en float64
+    completed = df["CompletedMass_Row"].to_numpy(dtype="float64")
+    ranks = df["_EtapeRank"].to_numpy()  # rang précalculé par recompute_progress
+    codes = df["PHASE"].cat.codes.to_numpy()
+    if codes.size:
+        starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+        phase_names = df["PHASE"].cat.categories[codes[starts]]
+        phase_totals = np.add.reduceat(mass, starts)
+        phase_treated = np.add.reduceat(completed, starts)
+    else:
+        phase_names, phase_totals, phase_treated = pd.Index([]), np.zeros(0), np.zeros(0)
+    return ProgressSummary(
+        total_mass=float(mass.sum()),
+        completed_global_mass=float(completed.sum()),
+        step_treated=_cum_mass(ranks, mass, len(STEPS_ORDER)),
+        phase_names=phase_names,
+        phase_totals=phase_totals,
+        phase_treated=phase_treated,
+    )
+
+
+def step_advancement(summary: ProgressSummary) -> pd.DataFrame:
     """Avancement par étape TOR (cumulatif par rang)."""
-    total_mass = df["TOT MASS (Kg)"].sum()
-    rows = []
-    for step in STEPS_ORDER:
-        treated_mass = df.loc[
-            df["Etape"].map(lambda s: STEP_RANK.get(s, -1)) >= STEP_RANK[step],
-            "TOT MASS (Kg)"
-        ].sum()
-        pct = (treated_mass / total_mass) * 100 if total_mass > 0 else 0.0
-        rows.append({"Etape": step, "CompletedMass": treated_mass, "Avancement%": pct})
-    return pd.DataFrame(rows)
-
-
-@st.cache_data(show_spinner=False)
-def phase_advancement(df: pd.DataFrame) -> pd.DataFrame:
+    treated = summary.step_treated
+    pct = treated / summary.total_mass * 100 if summary.total_mass > 0 else np.zeros(len(STEPS_ORDER))
+    return pd.DataFrame({"Etape": STEPS_ORDER, "CompletedMass": treated, "Avancement%": pct})
+
+
+def phase_advancement(summary: ProgressSummary) -> pd.DataFrame:
     """Avancement par PHASE (pondéré via CompletedMass_Row)."""
-    rows = []
-    for phase in sorted(df["PHASE"].unique()):
-        phase_total_mass = df.loc[df["PHASE"] == phase, "TOT MASS (Kg)"].sum()
-        treated_mass = df.loc[df["PHASE"] == phase, "CompletedMass_Row"].sum()
-        pct = (treated_mass / phase_total_mass) * 100 if phase_total_mass > 0 else 0.0
-        rows.append({"PHASE": phase, "CompletedMass": treated_mass, "Avancement%": pct})
-    return pd.DataFrame(rows)
+    total, treated = summary.phase_totals, summary.phase_treated
+    pct = np.divide(treated * 100, total, out=np.zeros(len(total)), where=total > 0)
+    return pd.DataFrame({"PHASE": summary.phase_names, "CompletedMass": treated, "Avancement%": pct})
 
 
-@st.cache_data(show_spinner=False)
 def assembly_table(df: pd.DataFrame) -> pd.DataFrame:
     """Vue par assemblage (utilisée au besoin, lecture seule ici)."""
-    agg = df.groupby(["PHASE", "ASSEMBLY NO."]).agg(
+    agg = df.groupby(["PHASE", "ASSEMBLY NO."], observed=True).agg(
         AssemblyMass=("TOT MASS (Kg)", "sum"),
-        EtapeRank=("Etape", lambda s: min([STEP_RANK.get(x, -1) for x in s]) if len(s) else -1)
+        EtapeRank=("_EtapeRank", "min")
     ).reset_index()
-    inv_rank = {v: k for k, v in STEP_RANK.items()}
-    agg["EtapeAsm"] = agg["EtapeRank"].map(inv_rank).fillna("None")
+    # Rang -1 (aucune étape) -> dernier libellé "None"
+    names = np.array(STEPS_ORDER + ["None"])
+    agg["EtapeAsm"] = names[agg["EtapeRank"].to_numpy()]
     return agg[["PHASE", "ASSEMBLY NO.", "AssemblyMass", "EtapeAsm"]]
 
-# Première recomputation
-st.session_state["df"] = recompute_progress(st.session_state["df"])
+# Première recomputation (une seule fois par source chargée)
+if not st.session_state.get("progress_ready"):
+    recompute_progress(st.session_state["df"])
+    st.session_state["progress_ready"] = True
+    st.session_state["df_version"] = st.session_state.get("df_version", 0) + 1
 
 # ------------------------------
-# 3) Onglets principaux (Lecture seule)
+# 2.b) Figures Plotly (mises en cache)
 # ------------------------------
-tab_kpi, tab_graph = st.tabs(["📈 KPI", "📊 Graphiques"])
+# Les fabriques reçoivent des tuples hashables : la figure n'est reconstruite que si les agrégats changent.
 
-# ------------------------------
-# 📈 3.2 KPI
-# ------------------------------
-with tab_kpi:
-    st.subheader("Indicateurs Globaux")
-    total_mass = float(st.session_state["df"]["TOT MASS (Kg)"].sum())
-    completed_global_mass = float(st.session_state["df"]["CompletedMass_Row"].sum())
-    progress_global = (completed_global_mass / total_mass) * 100 if total_mass > 0 else 0.0
+# Barres de synthèse : taille fixe + rendu statique (pas de relayout au redimensionnement)
+STATIC_BAR_LAYOUT = dict(width=900, height=400, margin=dict(l=30, r=10, t=40, b=30))
+STATIC_CHART_CONFIG = {"staticPlot": True, "displayModeBar": False}
 
-    k1, k2, k3 = st.columns(3)
-    k1.metric("Masse Totale (Kg)", f"{total_mass:,.2f}")
-    k2.metric("Masse Terminée (Kg)", f"{completed_global_mass:,.2f}")
-    k3.metric("Avancement Global", f"{progress_global:.2f}%")
+def frame_key(df: pd.DataFrame) -> tuple:
+    """Petit agrégat -> tuple de lignes (clé de cache hashable)."""
+    return tuple(df.itertuples(index=False, name=None))
 
-    gauge_color = "green" if progress_global >= 80 else ("orange" if progress_global >= 50 else "red")
-    fig_gauge = go.Figure(go.Indicator(
+
+def _build_gauge_template() -> go.Figure:
+    """Jauge sans valeur : construite une fois par session (voir build_gauge)."""
+    return go.Figure(go.Indicator(
         mode="gauge+number",
-        value=progress_global,
+        value=0.0,
         title={'text': "Avancement Global (%)"},
         gauge={
             'axis': {'range': [0, 100]},
-            'bar': {'color': gauge_color},
+            'bar': {'color': GAUGE_COLORS[0]},
             'steps': [
                 {'range': [0, 50], 'color': '#ffd6d6'},
                 {'range': [50, 80], 'color': '#ffe9b5'},
@@ -200,19 +461,22 @@ with tab_kpi:
             ]
         }
     ))
-    st.plotly_chart(fig_gauge, use_container_width=True)
 
-    st.divider()
-    st.subheader("Avancement par Étape (TOR)")
-    df_steps = step_advancement(st.session_state["df"])  # cumulatif par rang
-    st.dataframe(
-        df_steps.rename(columns={
-            "Etape": "Étape",
-            "CompletedMass": "Masse traitée (Kg)",
-            "Avancement%": "Avancement (%)"
-        }),
-        use_container_width=True
-    )
+
+def build_gauge(progress_global: float) -> go.Figure:
+    """Jauge d'avancement global : seules la valeur et la couleur de barre sont mises à jour."""
+    if "gauge_fig" not in st.session_state:
+        st.session_state["gauge_fig"] = _build_gauge_template()
+    fig = st.session_state["gauge_fig"]
+    gauge_color = GAUGE_COLORS[bisect_right(GAUGE_THRESHOLDS, progress_global)]
+    fig.update_traces(value=progress_global, gauge_bar_color=gauge_color, selector=dict(type="indicator"))
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_step_bar(steps: tuple) -> go.Figure:
+    """Barres d'avancement par étape (lignes de step_advancement)."""
+    df_steps = pd.DataFrame(list(steps), columns=["Etape", "CompletedMass", "Avancement%"])
     fig_bar_steps = px.bar(
         df_steps,
         x="Etape",
@@ -224,19 +488,14 @@ with tab_kpi:
     )
     fig_bar_steps.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
     fig_bar_steps.update_yaxes(title="%", range=[0, 100])
-    st.plotly_chart(fig_bar_steps, use_container_width=True)
+    fig_bar_steps.update_layout(**STATIC_BAR_LAYOUT)
+    return fig_bar_steps
 
-    st.divider()
-    st.subheader("Avancement par PHASE (pondéré)")
-    df_phase = phase_advancement(st.session_state["df"])  # pondéré par PROGRESS_MAP
-    st.dataframe(
-        df_phase.rename(columns={
-            "PHASE": "Phase",
-            "CompletedMass": "Masse traitée (Kg)",
-            "Avancement%": "Avancement (%)"
-        }),
-        use_container_width=True
-    )
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_phase_bar(phases: tuple) -> go.Figure:
+    """Barres d'avancement par PHASE (lignes de phase_advancement)."""
+    df_phase = pd.DataFrame(list(phases), columns=["PHASE", "CompletedMass", "Avancement%"])
     fig_bar_phase = px.bar(
         df_phase,
         x="PHASE",
@@ -247,19 +506,19 @@ with tab_kpi:
     )
     fig_bar_phase.update_traces(texttemplate="%{text:.2f}%", textposition="outside")
     fig_bar_phase.update_yaxes(title="%", range=[0, 100])
-    st.plotly_chart(fig_bar_phase, use_container_width=True)
+    fig_bar_phase.update_layout(**STATIC_BAR_LAYOUT)
+    return fig_bar_phase
 
-# ------------------------------
-# 📊 3.3 Graphiques
-# ------------------------------
-with tab_graph:
-    st.subheader("Diagramme S — Progression cumulée par Étape (TOR)")
-    df_steps = step_advancement(st.session_state["df"]).copy()
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def build_s_curve(steps: tuple) -> go.Figure:
+    """Diagramme S (lignes de step_advancement)."""
+    df_steps = pd.DataFrame(list(steps), columns=["Etape", "CompletedMass", "Avancement%"])
     # CompletedMass est déjà cumulative par construction (rang >= step)
     df_steps["Cumul_Masse"] = df_steps["CompletedMass"]
 
     fig_s = go.Figure()
-    fig_s.add_trace(go.Scatter(
+    fig_s.add_trace(go.Scattergl(  # rendu WebGL : tient la charge si les étapes se multiplient
         x=df_steps["Etape"], y=df_steps["Avancement%"],
         mode="lines+markers", name="Avancement cumulé (%)",
         line=dict(width=3, color="#1f77b4")
@@ -272,6 +531,88 @@ with tab_graph:
         title="Diagramme S — % cumulé & masse cumulée",
         yaxis=dict(title="% cumulé", range=[0, 100]),
         yaxis2=dict(title="Masse (Kg)", overlaying="y", side="right"),
-        legend=dict(orientation="h")
+        legend=dict(orientation="h"),
+        hovermode="x unified",
+        uirevision="s-curve",  # conserve zoom / légende entre reruns
+    )
+    return fig_s
+
+
+# ------------------------------
+# 3) Onglets principaux (Lecture seule)
+# ------------------------------
+# Chaque onglet est un fragment ; rendu en fin de script.
+
+# Masses stockées en float32 : affichage borné à 2 décimales (comme les métriques)
+MASS_COLUMN = st.column_config.NumberColumn(format="%.2f")
+
+# ------------------------------
+# 📈 3.2 KPI
+# ------------------------------
+@st.fragment
+def kpi_tab(summary: ProgressSummary) -> None:
+    """Onglet KPI (fragment : une interaction ici ne relance que cet onglet)."""
+    st.subheader("Indicateurs Globaux")
+    total_mass = summary.total_mass
+    completed_global_mass = summary.completed_global_mass
+    progress_global = summary.progress_global
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Masse Totale (Kg)", f"{total_mass:,.2f}")
+    k2.metric("Masse Terminée (Kg)", f"{completed_global_mass:,.2f}")
+    k3.metric("Avancement Global", f"{progress_global:.2f}%")
+
+    fig_gauge = build_gauge(progress_global)
+    st.plotly_chart(fig_gauge, use_container_width=True)
+
+    st.divider()
+    st.subheader("Avancement par Étape (TOR)")
+    df_steps = step_advancement(summary)  # cumulatif par rang
+    st.dataframe(
+        df_steps.rename(columns={
+            "Etape": "Étape",
+            "CompletedMass": "Masse traitée (Kg)",
+            "Avancement%": "Avancement (%)"
+        }),
+        use_container_width=True,
+        column_config={"Masse traitée (Kg)": MASS_COLUMN},
+    )
+    fig_bar_steps = build_step_bar(frame_key(df_steps))
+    st.plotly_chart(fig_bar_steps, use_container_width=False, config=STATIC_CHART_CONFIG)
+
+    st.divider()
+    st.subheader("Avancement par PHASE (pondéré)")
+    df_phase = phase_advancement(summary)  # pondéré par PROGRESS_MAP
+    st.dataframe(
+        df_phase.rename(columns={
+            "PHASE": "Phase",
+            "CompletedMass": "Masse traitée (Kg)",
+            "Avancement%": "Avancement (%)"
+        }),
+        use_container_width=True,
+        column_config={"Masse traitée (Kg)": MASS_COLUMN},
     )
+    fig_bar_phase = build_phase_bar(frame_key(df_phase))
+    st.plotly_chart(fig_bar_phase, use_container_width=False, config=STATIC_CHART_CONFIG)
+
+# ------------------------------
+# 📊 3.3 Graphiques
+# ------------------------------
+@st.fragment
+def graph_tab(summary: ProgressSummary) -> None:
+    """Onglet Graphiques (fragment : une interaction ici ne relance que cet onglet)."""
+    st.subheader("Diagramme S — Progression cumulée par Étape (TOR)")
+    df_steps = step_advancement(summary)
+    fig_s = build_s_curve(frame_key(df_steps))
     st.plotly_chart(fig_s, use_container_width=True)
+
+
+# ------------------------------
+# 3.4 Rendu des onglets
+# ------------------------------
+summary = session_cached("summary", compute_all, st.session_state["df"])  # une passe pour les deux onglets
+tab_kpi, tab_graph = st.tabs(["📈 KPI", "📊 Graphiques"])
+with tab_kpi:
+    kpi_tab(summary)
+with tab_graph:
+    graph_tab(summary)